@@ -1,34 +1,40 @@
 from __future__ import annotations
 
-import contextlib
 import types
 import warnings
 import weakref
+from abc import get_cache_token
 from collections.abc import Iterable, Iterator, Mapping
 from contextlib import AbstractContextManager
-from functools import cached_property, wraps
-from inspect import CO_VARARGS, isgeneratorfunction, unwrap
-from logging import getLogger
+from functools import wraps
+from inspect import CO_VARARGS, CO_VARKEYWORDS, isgeneratorfunction, unwrap
+from itertools import chain
+from logging import DEBUG, getLogger
+from operator import itemgetter
 from types import CodeType
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    ForwardRef,
     NamedTuple,
-    Optional,
     TypeVar,
     Union,
-    cast,
     overload,
 )
 
-from ._type_resolution import _resolve_sig_or_inform, resolve_type_hints
+from ._type_resolution import (
+    _guessed_self_class_name,
+    _resolve_sig_or_inform,
+    resolve_type_hints,
+)
 from ._util import _split_union, is_optional, issubclassable
 
 logger = getLogger("in_n_out")
 
 
 if TYPE_CHECKING:
+    from inspect import Signature
     from typing import ClassVar, Literal
 
     from typing_extensions import ParamSpec
@@ -76,9 +82,6 @@ CallbackIterable = Union[ProviderIterable, ProcessorIterable]
 _GLOBAL = "global"
 
 
-class _NullSentinel: ...
-
-
 class _RegisteredCallback(NamedTuple):
     origin: type
     callback: Callable
@@ -87,9 +90,27 @@ class _RegisteredCallback(NamedTuple):
     subclassable: bool
 
 
+# positional getters for _RegisteredCallback fields, used in sort keys and when
+# collecting callbacks, where they avoid the named field descriptor lookup.
+_get_callback = itemgetter(_RegisteredCallback._fields.index("callback"))
+# how we sort registered callbacks within the same type hint (descending weight).
+# `sorted` is stable, so callbacks of equal weight keep their registration order.
+_by_weight = itemgetter(_RegisteredCallback._fields.index("weight"))
+
+
 class _CachedMap(NamedTuple):
-    all: dict[object, list[Processor | Provider]]
-    subclassable: dict[type, list[Processor | Provider]]
+    # buckets of registered callbacks, sorted by descending weight
+    all: dict[object, list[_RegisteredCallback]]
+    subclassable: dict[type, list[_RegisteredCallback]]
+    # memo of hint -> callbacks registered for exactly that hint, dropped along with
+    # the map itself.  (Its keys are registered origins, kept alive by the registry.)
+    resolved: dict[object, tuple[Callable, ...]]
+    # memo of class -> callbacks found by the subclass scan.  Weakly keyed, so that
+    # dynamically created classes aren't kept alive, and cleared by the resolver
+    # whenever an ABC registers a virtual subclass (see `abc.get_cache_token`).
+    scanned: weakref.WeakKeyDictionary[type, tuple[Callable, ...]]
+    # resolves a hint to its callbacks, with the maps above bound in its closure
+    resolve: Callable[[object], tuple[Callable, ...]]
 
 
 class InjectionContext(AbstractContextManager):
@@ -124,7 +145,6 @@ class InjectionContext(AbstractContextManager):
 class Store:
     """A Store is a collection of providers and processors."""
 
-    _NULL = _NullSentinel()
     _instances: ClassVar[dict[str, Store]] = {}
 
     @classmethod
@@ -175,10 +195,11 @@ class Store:
         KeyError
             If the name is not in use.
         """
-        name = (name or _GLOBAL).lower()
-        if name not in cls._instances:
+        name = name.lower() if name else _GLOBAL
+        store = cls._instances.get(name)
+        if store is None:
             raise KeyError(f"Store {name!r} does not exist")
-        return cls._instances[name]
+        return store
 
     @classmethod
     def destroy(cls, name: str) -> None:
@@ -207,6 +228,12 @@ class Store:
         self._name = name
         self._providers: list[_RegisteredCallback] = []
         self._processors: list[_RegisteredCallback] = []
+        # generation counters, bumped whenever a registry changes.  The cached maps
+        # are rebuilt lazily when their generation no longer matches.
+        self._providers_gen: int = 0
+        self._processors_gen: int = 0
+        self._provider_cache: tuple[int, _CachedMap | None] = (-1, None)
+        self._processor_cache: tuple[int, _CachedMap | None] = (-1, None)
         self._namespace: Namespace | Callable[[], Namespace] | None = None
         self.on_unresolved_required_args: RaiseWarnReturnIgnore = "warn"
         self.on_unannotated_required_args: RaiseWarnReturnIgnore = "warn"
@@ -221,10 +248,8 @@ class Store:
         """Clear all providers and processors."""
         self._providers.clear()
         self._processors.clear()
-        with contextlib.suppress(AttributeError):
-            del self._cached_processor_map
-        with contextlib.suppress(AttributeError):
-            del self._cached_provider_map
+        self._invalidate_cache(True)
+        self._invalidate_cache(False)
 
     @property
     def namespace(self) -> dict[str, object]:
@@ -242,6 +267,19 @@ class Store:
     def namespace(self, ns: Namespace | Callable[[], Namespace]) -> None:
         self._namespace = ns
 
+    def _namespace_readonly(self) -> dict[str, object]:
+        """Return the namespace for read-only use, copying it only if not a dict.
+
+        Unlike `namespace`, this may return the store's own dict, so callers must not
+        modify the result.
+        """
+        ns = self._namespace
+        if ns is None:
+            return {}
+        if callable(ns):
+            ns = ns()
+        return ns if type(ns) is dict else dict(ns)
+
     # ------------------------- Callback registration ------------------------------
 
     def register(
@@ -491,7 +529,7 @@ class Store:
         Iterable[Callable[[], T | None]]
             Iterable of provider callbacks.
         """
-        return self._iter_type_map(type_hint, self._cached_provider_map)
+        return iter(self._get_providers(type_hint))
 
     def iter_processors(
         self, type_hint: type[T] | object
@@ -508,7 +546,7 @@ class Store:
         Iterable[Callable[[], T | None]]
             Iterable of processor callbacks.
         """
-        return self._iter_type_map(type_hint, self._cached_processor_map)
+        return iter(self._get_processors(type_hint))
 
     # ------------------------- Instance retrieval ------------------------------
 
@@ -529,8 +567,8 @@ class Store:
             The first non-`None` value returned by a provider, or `None` if no
             providers return a value.
         """
-        for provider in self.iter_providers(type_hint):
-            result = provider()
+        for provider in self._get_providers(type_hint):
+            result: T | None = provider()
             if result is not None:
                 return result
         return None
@@ -569,13 +607,16 @@ class Store:
         """
         if type_hint is None:
             type_hint = type(result)
-        _processors: Iterable[Callable] = self.iter_processors(type_hint)
-        logger.debug(
-            "Invoking processors on result %r from function %r", result, _funcname
-        )
+        _processors = self._get_processors(type_hint)
+        debug = logger.isEnabledFor(DEBUG)
+        if debug:
+            logger.debug(
+                "Invoking processors on result %r from function %r", result, _funcname
+            )
         for processor in _processors:
             try:
-                logger.debug("  P: %s", processor)
+                if debug:
+                    logger.debug("  P: %s", processor)
                 processor(result)
             except Exception as e:  # pragma: no cover
                 if raise_exception:
@@ -732,20 +773,36 @@ class Store:
                 return self.inject_processors(func) if processors else func
 
             # bail if there aren't any annotations at all
-            code: CodeType | None = getattr(unwrap(func), "__code__", None)
+            unwrapped = unwrap(func)
+            code: CodeType | None = getattr(unwrapped, "__code__", None)
             if (code and not code.co_argcount) and "return" not in getattr(
                 func, "__annotations__", {}
             ):
                 return func
+            # whether the signature is func's own (and not that of a function it wraps,
+            # or an explicit __signature__)
+            own_sig = unwrapped is func and getattr(func, "__signature__", None) is None
+            # ... or if there is no parameter that could possibly be injected
+            if (
+                own_sig
+                and code
+                and not processors
+                and _nothing_to_inject(func, code, _guess_self)
+            ):
+                return func
 
             # get a signature object with all type annotations resolved
             # this may result in a NameError if a required argument is unresolvable.
             # There may also be unannotated required arguments, which will likely fail
             # when the function is called later. We break this out into a separate
             # function to handle notifying the user on these cases.
-            sig = _resolve_sig_or_inform(
+            # (explicitly provided locals take precedence over the store namespace)
+            _localns = self._namespace_readonly()
+            if localns:
+                _localns = {**_localns, **localns}
+            sig = _resolve_sig_cached(
                 func,
-                localns={**self.namespace, **(localns or {})},
+                localns=_localns,
                 on_unresolved_required_args=on_unres,
                 on_unannotated_required_args=on_unann,
                 guess_self=_guess_self,
@@ -754,66 +811,82 @@ class Store:
                 return func
 
             _fname = getattr(func, "__qualname__", func)
+            # (name, annotation, is_optional) for each parameter, computed once here
+            # rather than walking the `Parameter` objects on every call.
+            _plan = [
+                (p.name, p.annotation, is_optional(p.annotation))
+                for p in sig.parameters.values()
+            ]
+            _bind = _make_binder(sig)
+            # (args can only be passed straight through if `sig` is func's own)
+            _all_given = _make_all_given(sig) if own_sig else None
+            # (name, annotation) of the required parameters, for error reporting
+            _required = [
+                (p.name, p.annotation)
+                for p in sig.parameters.values()
+                if p.default is p.empty
+            ]
 
             # get provider functions for each required parameter
             @wraps(func)
             def _exec(*args: P.args, **kwargs: P.kwargs) -> R:
+                # if the caller supplied every parameter, there's nothing to inject
+                if _all_given is not None and _all_given(args, kwargs):
+                    return func(*args, **kwargs)
+
                 # we're actually calling the "injected function" now
-                logger.debug(
-                    "Executing @injected %s%s with args: %r, kwargs: %r",
-                    _fname,
-                    sig,
-                    args,
-                    kwargs,
-                )
+                debug = logger.isEnabledFor(DEBUG)
+                if debug:
+                    logger.debug(
+                        "Executing @injected %s%s with args: %r, kwargs: %r",
+                        _fname,
+                        sig,
+                        args,
+                        kwargs,
+                    )
 
-                # use bind_partial to allow the caller to still provide their own args
+                # bind partially to allow the caller to still provide their own args
                 # if desired. (i.e. the injected deps are only used if not provided)
-                bound = sig.bind_partial(*args, **kwargs)
-                bound.apply_defaults()
+                arguments = _bind(args, kwargs)
 
                 # first, get and call the provider functions for each parameter type:
                 _injected_names: set[str] = set()
-                for param in sig.parameters.values():
-                    if (
-                        param.name not in bound.arguments
-                        or bound.arguments[param.name] is None
-                    ):
-                        provided = self.provide(param.annotation)
-                        if provided is not None or is_optional(param.annotation):
-                            logger.debug(
-                                "  injecting %s: %s = %r",
-                                param.name,
-                                param.annotation,
-                                provided,
-                            )
-                            _injected_names.add(param.name)
-                            bound.arguments[param.name] = provided
+                for name, annotation, optional in _plan:
+                    if arguments.get(name) is None:
+                        provided = self.provide(annotation)
+                        if provided is not None or optional:
+                            if debug:
+                                logger.debug(
+                                    "  injecting %s: %s = %r",
+                                    name,
+                                    annotation,
+                                    provided,
+                                )
+                                _injected_names.add(name)
+                            arguments[name] = provided
 
                 # call the function with injected values
-                logger.debug(
-                    "  Calling %s with %r (injected %r)",
-                    _fname,
-                    bound.arguments,
-                    _injected_names,
-                )
+                if debug:
+                    logger.debug(
+                        "  Calling %s with %r (injected %r)",
+                        _fname,
+                        arguments,
+                        _injected_names,
+                    )
                 try:
-                    result = func(**bound.arguments)  # type: ignore[call-arg]
+                    result = func(**arguments)  # type: ignore[call-arg]
                 except TypeError as e:
                     if "missing" not in e.args[0]:
                         raise  # pragma: no cover
                     # likely a required argument is still missing.
                     # show what was injected and raise
                     logger.exception(e)
-                    for param in sig.parameters.values():
-                        if (
-                            param.name not in bound.arguments
-                            and param.default is param.empty
-                        ):
+                    for name, annotation in _required:
+                        if name not in arguments:
                             logger.error(
-                                f"Do not have argument for {param.name}: using "
+                                f"Do not have argument for {name}: using "
                                 "providers "
-                                f"{list(self.iter_providers(param.annotation))}"
+                                f"{list(self.iter_providers(annotation))}"
                             )
 
                     mod_name = getattr(func, "__module__", "")
@@ -821,7 +894,7 @@ class Store:
                     full_name = f"{mod_name}.{func_name}"
                     raise TypeError(
                         f"Error calling in-n-out injected function {full_name!r} with "
-                        f"kwargs {bound.arguments!r}.\n\n"
+                        f"kwargs {arguments!r}.\n\n"
                         f"See {type(e).__name__} above for more details."
                     ) from e
 
@@ -840,10 +913,9 @@ class Store:
 
             # update some metadata on the decorated function.
             out.__signature__ = sig  # type: ignore [attr-defined]
-            out.__annotations__ = {
-                **{p.name: p.annotation for p in sig.parameters.values()},
-                "return": sig.return_annotation,
-            }
+            annotations = {name: annotation for name, annotation, _ in _plan}
+            annotations["return"] = sig.return_annotation
+            out.__annotations__ = annotations
             out.__doc__ = (
                 out.__doc__ or ""
             ) + "\n\n*This function will inject dependencies when called.*"
@@ -925,17 +997,24 @@ class Store:
                 annotations = getattr(func, "__annotations__", {})
                 if "return" in annotations:
                     type_hint = annotations["return"]
+                    if type_hint is None:  # annotated `-> None`
+                        return func
+            # a function that returns None has nothing to process, so needn't be wrapped
+            if type_hint is type(None):
+                return func
+            _fname = getattr(func, "__qualname__", str(func))
 
             @wraps(func)
             def _exec(*args: P.args, **kwargs: P.kwargs) -> R:
                 result = func(*args, **kwargs)
-                if result is not None:
+                # (skip process() entirely while no processors are registered)
+                if result is not None and self._processors:
                     self.process(
                         result,
                         type_hint=type_hint,
                         first_processor_only=first_processor_only,
                         raise_exception=raise_exception,
-                        _funcname=getattr(func, "__qualname__", str(func)),
+                        _funcname=_fname,
                     )
                 return result
 
@@ -945,15 +1024,102 @@ class Store:
 
     # ----------------------  Private methods ----------------------- #
 
-    @cached_property
+    @property
     def _cached_provider_map(self) -> _CachedMap:
-        logger.debug("Rebuilding provider map cache")
-        return self._build_map(self._providers)
+        gen, cache = self._provider_cache
+        if cache is None or gen != self._providers_gen:
+            logger.debug("Rebuilding provider map cache")
+            # read the generation first, in case the registry changes mid-build
+            gen = self._providers_gen
+            cache = self._build_map(self._providers)
+            self._provider_cache = (gen, cache)
+        return cache
 
-    @cached_property
+    @property
     def _cached_processor_map(self) -> _CachedMap:
-        logger.debug("Rebuilding processor map cache")
-        return self._build_map(self._processors)
+        gen, cache = self._processor_cache
+        if cache is None or gen != self._processors_gen:
+            logger.debug("Rebuilding processor map cache")
+            # read the generation first, in case the registry changes mid-build
+            gen = self._processors_gen
+            cache = self._build_map(self._processors)
+            self._processor_cache = (gen, cache)
+        return cache
+
+    def _invalidate_cache(self, is_provider: bool) -> None:
+        """Mark the provider (or processor) map as stale."""
+        if is_provider:
+            self._providers_gen += 1
+        else:
+            self._processors_gen += 1
+
+    def _get_providers(self, type_hint: object) -> tuple[Callable, ...]:
+        """Return all providers of `type_hint`, in order of descending weight."""
+        cmap = self._cached_provider_map
+        # fast path: a hint that was already resolved is a single dict lookup
+        try:
+            callbacks = cmap.resolved.get(type_hint)
+        except TypeError:  # unhashable hint
+            callbacks = None
+        return cmap.resolve(type_hint) if callbacks is None else callbacks
+
+    def _get_processors(self, type_hint: object) -> tuple[Callable, ...]:
+        """Return all processors of `type_hint`, in order of descending weight."""
+        cmap = self._cached_processor_map
+        try:
+            callbacks = cmap.resolved.get(type_hint)
+        except TypeError:  # unhashable hint
+            callbacks = None
+        return cmap.resolve(type_hint) if callbacks is None else callbacks
+
+    def _update_cache(
+        self,
+        is_provider: bool,
+        added: Iterable[_RegisteredCallback] = (),
+        removed: Iterable[_RegisteredCallback] = (),
+    ) -> None:
+        """Apply registry changes to the cached map in place.
+
+        This avoids a full rebuild of the map when registrations are interleaved with
+        lookups.  If the map isn't currently built (or is already stale) there is
+        nothing to do: it will be rebuilt from the registry on next access.
+        """
+        if is_provider:
+            gen, cmap = self._provider_cache
+            current = self._providers_gen
+        else:
+            gen, cmap = self._processor_cache
+            current = self._processors_gen
+        if cmap is None or gen != current:
+            return
+
+        for p in removed:
+            old = cmap.all[p.origin]
+            old.remove(p)
+            if not old:
+                del cmap.all[p.origin]
+                cmap.subclassable.pop(p.origin, None)
+            elif p.subclassable:
+                # the precedence of a subclassable hint follows its earliest
+                # registration, which may have just changed. Rebuild from scratch.
+                self._invalidate_cache(is_provider)
+                return
+
+        for p in added:
+            bucket = cmap.all.get(p.origin)
+            if bucket is None:
+                # (shared with the subclassable map, as in _build_map)
+                bucket = cmap.all[p.origin] = []
+                if p.subclassable:
+                    cmap.subclassable[p.origin] = bucket
+            # insert after all callbacks of greater or equal weight
+            idx = next(
+                (i for i, q in enumerate(bucket) if q.weight < p.weight), len(bucket)
+            )
+            bucket.insert(idx, p)
+
+        cmap.resolved.clear()
+        cmap.scanned.clear()
 
     def _build_map(self, registry: list[_RegisteredCallback]) -> _CachedMap:
         """Build a map of type hints to callbacks.
@@ -964,48 +1130,36 @@ class Store:
         with `is_subclass`.  The second is a map of only "issubclassable" type hints.
         """
         all_: dict[object, list[_RegisteredCallback]] = {}
-        subclassable: dict[type, list[_RegisteredCallback]] = {}
+        subclassable: list[type] = []
         for p in registry:
-            if p.origin not in all_:
-                all_[p.origin] = []
-            all_[p.origin].append(p)
-            if p.subclassable:
-                if p.origin not in subclassable:
-                    subclassable[p.origin] = []
-                subclassable[p.origin].append(p)
-
-        all_out = {
-            hint: [v.callback for v in sorted(val, key=self._sort_key, reverse=True)]
-            for hint, val in all_.items()
-        }
-        subclassable_out = {
-            hint: [v.callback for v in sorted(val, key=self._sort_key, reverse=True)]
-            for hint, val in subclassable.items()
-        }
-        return _CachedMap(all_out, subclassable_out)
-
-    def _iter_type_map(
-        self, hint: type[T] | object, callback_map: _CachedMap
-    ) -> Iterator[Callable]:
-        _all_types = callback_map.all
-        _subclassable_types = callback_map.subclassable
-
-        for origin in _split_union(hint)[0]:
-            if origin in _all_types:
-                yield from _all_types[origin]
-                return
-
-            if isinstance(origin, type):
-                # we need origin to be a type to be able to check if it's a
-                # subclass of other types
-                for _hint, processor in _subclassable_types.items():
-                    if issubclass(origin, _hint):
-                        yield from processor
-                        return
-
-    def _sort_key(self, p: _RegisteredCallback) -> float:
-        """How we sort registered callbacks within the same type hint."""
-        return p.weight
+            bucket = all_.get(p.origin)
+            if bucket is None:
+                bucket = all_[p.origin] = []
+                # subclassability is a property of the origin alone, so every
+                # callback in a bucket shares the flag of its first member.
+                if p.subclassable:
+                    subclassable.append(p.origin)
+            bucket.append(p)
+
+        # buckets are fresh lists, so sort them in place (single-item buckets, by far
+        # the most common, needn't be sorted at all).  Later registrations are
+        # inserted in order by _update_cache, so this only happens on a full rebuild.
+        for val in all_.values():
+            if len(val) > 1:
+                val.sort(key=_by_weight, reverse=True)
+        # the subclassable map shares (rather than re-sorts) the buckets of all_
+        subclassable_out = {hint: all_[hint] for hint in subclassable}
+        resolved: dict[object, tuple[Callable, ...]] = {}
+        scanned: weakref.WeakKeyDictionary[type, tuple[Callable, ...]] = (
+            weakref.WeakKeyDictionary()
+        )
+        return _CachedMap(
+            all_,
+            subclassable_out,
+            resolved,
+            scanned,
+            _type_map_resolver(all_, subclassable_out, resolved, scanned),
+        )
 
     def _register_callbacks(
         self,
@@ -1014,52 +1168,45 @@ class Store:
     ) -> Disposer:
         if is_provider:
             reg = self._providers
-            cache_map = "_cached_provider_map"
             check_callback: Callable[[Any], Callable] = _validate_provider
             err_msg = (
                 "{} has no return type hint (and no hint provided at "
                 "registration). Cannot be a provider."
             )
-
-            def _type_from_hints(hints: dict[str, Any]) -> Any:
-                return hints.get("return")
-
+            type_from_hints: Callable[[dict[str, Any]], Any] = _provider_type_from_hints
         else:
             reg = self._processors
-            cache_map = "_cached_processor_map"
             check_callback = _validate_processor
             err_msg = (
                 "{} has no argument type hints (and no hint provided "
                 "at registration). Cannot be a processor."
             )
-
-            def _type_from_hints(hints: dict[str, Any]) -> Any:
-                return next((v for k, v in hints.items() if k != "return"), None)
+            type_from_hints = _processor_type_from_hints
 
         _callbacks: Iterable[CallbackTuple]
-        if isinstance(callbacks, Mapping):
+        # (check for a plain dict first, the common case, before the slower ABC check)
+        if type(callbacks) is dict or isinstance(callbacks, Mapping):
             _callbacks = ((v, k) for k, v in callbacks.items())  # type: ignore  # dunno
         else:
             _callbacks = callbacks
 
         regname = "provider" if is_provider else "processor"
         to_register: list[_RegisteredCallback] = []
+        # only evaluated (once) if some callback needs its hints resolved
+        namespace: dict[str, object] | None = None
         for tup in _callbacks:
-            callback, *rest = tup
-            type_: THint | None = None
-            weight: float = 0
-            if rest:
-                if len(rest) == 1:
-                    type_ = rest[0]
-                    weight = 0
-                elif len(rest) == 2:
-                    type_, weight = cast(tuple[Optional[THint], float], rest)
-                else:  # pragma: no cover
-                    raise ValueError(f"Invalid callback tuple: {tup!r}")
+            n = len(tup)
+            if not 0 < n < 4:  # pragma: no cover
+                raise ValueError(f"Invalid callback tuple: {tup!r}")
+            callback = tup[0]
+            type_: THint | None = tup[1] if n > 1 else None  # type: ignore [misc]
+            weight: float = tup[2] if n > 2 else 0  # type: ignore [misc]
 
             if type_ is None:
-                hints = resolve_type_hints(callback, localns=self.namespace)
-                type_ = _type_from_hints(hints)
+                if namespace is None:
+                    namespace = self._namespace_readonly()
+                hints = resolve_type_hints(callback, localns=namespace)
+                type_ = type_from_hints(hints)
                 if type_ is None:
                     raise ValueError(err_msg.format(callback))
 
@@ -1068,7 +1215,7 @@ class Store:
             if isinstance(callback, types.MethodType):
                 # if the callback is a method, we need to wrap it in a weakref
                 # to prevent a strong reference to the owner object.
-                callback = self._methodwrap(callback, reg, cache_map)
+                callback = self._methodwrap(callback, reg, is_provider)
 
             origins, is_opt = _split_union(type_)
             for origin in origins:
@@ -1096,45 +1243,314 @@ class Store:
                 to_register.append(cb)
 
         def _dispose() -> None:
-            for p in to_register:
-                with contextlib.suppress(ValueError):
-                    reg.remove(p)
+            # remove our own entries (by identity) in a single pass over the registry
+            ours = {id(p) for p in to_register}
+            kept: list[_RegisteredCallback] = []
+            removed: list[_RegisteredCallback] = []
+            for p in reg:
+                (removed if id(p) in ours else kept).append(p)
+            if removed:
+                reg[:] = kept
+                for p in removed:
                     logger.debug(
                         "Unregistering %s of %s: %s", regname, p.origin, p.callback
                     )
-            # attribute error in case the cache was never built
-            with contextlib.suppress(AttributeError):
-                delattr(self, cache_map)
+                self._update_cache(is_provider, removed=removed)
 
         if to_register:
             reg.extend(to_register)
-            # attribute error in case the cache was never built
-            with contextlib.suppress(AttributeError):
-                delattr(self, cache_map)
+            self._update_cache(is_provider, added=to_register)
 
         return _dispose
 
     def _methodwrap(
-        self, callback: types.MethodType, reg: list[_RegisteredCallback], cache_map: str
+        self,
+        callback: types.MethodType,
+        reg: list[_RegisteredCallback],
+        is_provider: bool,
     ) -> Callable:
         """Wrap a method in a weakref to prevent a strong reference to the owner."""
-        ref = weakref.WeakMethod(callback)
+
+        def _prune(_: Any) -> None:
+            # The owner was garbage collected.  Remove it from the registry.
+            reg[:] = [item for item in reg if item.callback is not _callback]
+            self._invalidate_cache(is_provider)
+
+        ref = weakref.WeakMethod(callback, _prune)
 
         def _callback(*args: Any, **kwargs: Any) -> Any:
             cb = ref()
             if cb is not None:
                 return cb(*args, **kwargs)
 
-            # The callback was garbage collected.  Remove it from the registry.
-            for item in reversed(reg):
-                if item.callback is _callback:
-                    reg.remove(item)
+        return _callback
 
-            # attribute error in case the cache was never built
-            with contextlib.suppress(AttributeError):
-                delattr(self, cache_map)
 
-        return _callback
+def _type_map_resolver(
+    all_types: dict[object, list[_RegisteredCallback]],
+    subclassable_types: dict[type, list[_RegisteredCallback]],
+    resolved: dict[object, tuple[Callable, ...]],
+    scanned: weakref.WeakKeyDictionary[type, tuple[Callable, ...]],
+) -> Callable[[object], tuple[Callable, ...]]:
+    """Return a function that resolves a type hint to its callbacks.
+
+    The returned function closes over the maps built by `Store._build_map`.  Hints
+    registered exactly are memoized in `resolved`, and the results of the subclass
+    scan for other classes in `scanned` (both are cleared whenever a callback is
+    registered or disposed), so repeated lookups of the same hint needn't scan again.
+    Like `functools.singledispatch`, `scanned` is also cleared when the ABC cache
+    token changes, since registering a virtual subclass may change the result.
+    """
+    token = get_cache_token()
+
+    def _exact(origin: object) -> tuple[Callable, ...] | None:
+        bucket = all_types.get(origin)
+        if bucket is None:
+            return None
+        callbacks = resolved[origin] = tuple(map(_get_callback, bucket))
+        return callbacks
+
+    def _scan(cls: type) -> tuple[Callable, ...]:
+        if not subclassable_types:
+            return ()
+        nonlocal token
+        current = get_cache_token()
+        if current != token:
+            scanned.clear()
+            token = current
+        callbacks = scanned.get(cls)
+        if callbacks is None:
+            # we need origin to be a type to be able to check if it's a
+            # subclass of other types
+            callbacks = ()
+            for _hint, processor in subclassable_types.items():
+                if issubclass(cls, _hint):
+                    callbacks = tuple(map(_get_callback, processor))
+                    break
+            scanned[cls] = callbacks
+        return callbacks
+
+    def _iter_type_map(hint: object) -> tuple[Callable, ...]:
+        try:
+            return resolved[hint]
+        except (KeyError, TypeError):  # not yet resolved, or unhashable hint
+            pass
+
+        # plain classes (by far the most common hint) can never be a Union
+        if isinstance(hint, type):
+            callbacks = _exact(hint)
+            return _scan(hint) if callbacks is None else callbacks
+
+        origins = _split_union(hint)[0]
+        if len(origins) == 1 and origins[0] is hint:
+            callbacks = _exact(hint)
+            return () if callbacks is None else callbacks
+
+        # Union equality ignores the order of its members, so rather than memoizing
+        # the Union itself, resolve (and memoize) each of its members in order.
+        for origin in origins:
+            callbacks = _iter_type_map(origin)
+            if callbacks:
+                return callbacks
+        return ()
+
+    return _iter_type_map
+
+
+def _nothing_to_inject(func: Callable, code: CodeType, guess_self: bool) -> bool:
+    """Return True if no parameter of `func` is annotated or required.
+
+    Such a function can't have anything injected (and won't trigger any warnings
+    about unannotated required parameters), so it needn't be wrapped at all.
+    Variadic parameters are reported as required by `_resolve_sig_or_inform`, so
+    functions that have them are not considered here, and neither are methods whose
+    first parameter may be annotated with their class by `guess_self`.  `func` must
+    neither wrap another function nor have a `__signature__`, so that its own code,
+    defaults and annotations are the ones its signature is resolved from.
+    """
+    if code.co_flags & (CO_VARARGS | CO_VARKEYWORDS):
+        return False
+    if (
+        guess_self
+        and code.co_argcount + code.co_kwonlyargcount
+        and _guessed_self_class_name(func, code.co_varnames[0]) is not None
+    ):
+        return False
+    if any(k != "return" for k in getattr(func, "__annotations__", {})):
+        return False
+    n_defaults = len(getattr(func, "__defaults__", None) or ())
+    n_kwdefaults = len(getattr(func, "__kwdefaults__", None) or {})
+    return n_defaults == code.co_argcount and n_kwdefaults == code.co_kwonlyargcount
+
+
+def _make_binder(sig: Signature) -> Callable[[tuple, dict], dict[str, Any]]:
+    """Return a function that partially binds (args, kwargs) to `sig`.
+
+    The returned function is equivalent to `sig.bind_partial(*args, **kwargs)`
+    followed by `apply_defaults()`, returning the bound arguments. For the common
+    case of a signature made only of positional-or-keyword and keyword-only
+    parameters, arguments are bound directly. Anything else (including calls that
+    would fail to bind) is passed to `Signature.bind_partial`.
+    """
+    params = sig.parameters.values()
+    simple = all(p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) for p in params)
+    pos_names = tuple(p.name for p in params if p.kind is p.POSITIONAL_OR_KEYWORD)
+    names = frozenset(sig.parameters)
+    defaults = tuple((p.name, p.default) for p in params if p.default is not p.empty)
+
+    def _bind(args: tuple, kwargs: dict) -> dict[str, Any]:
+        if simple and len(args) <= len(pos_names) and names.issuperset(kwargs):
+            arguments = dict(zip(pos_names, args))
+            if arguments.keys().isdisjoint(kwargs):
+                arguments.update(kwargs)
+                for name, default in defaults:
+                    arguments.setdefault(name, default)
+                return arguments
+        bound = sig.bind_partial(*args, **kwargs)
+        bound.apply_defaults()
+        return bound.arguments
+
+    return _bind
+
+
+def _make_all_given(sig: Signature) -> Callable[[tuple, dict], bool] | None:
+    """Return a function that checks whether (args, kwargs) supply every parameter.
+
+    The returned function is True only if every parameter in `sig` is given exactly
+    once, and no given value is `None` (which would still be injected). Returns
+    `None` for signatures with positional-only or variadic parameters.
+    """
+    params = sig.parameters.values()
+    if not all(p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) for p in params):
+        return None
+    pos_names = tuple(p.name for p in params if p.kind is p.POSITIONAL_OR_KEYWORD)
+    names = frozenset(sig.parameters)
+    n_params = len(names)
+
+    def _all_given(args: tuple, kwargs: dict) -> bool:
+        n_args = len(args)
+        if n_args + len(kwargs) != n_params or n_args > len(pos_names):
+            return False
+        if kwargs and not (
+            names.issuperset(kwargs) and kwargs.keys().isdisjoint(pos_names[:n_args])
+        ):
+            return False
+        return all(a is not None for a in args) and all(
+            v is not None for v in kwargs.values()
+        )
+
+    return _all_given
+
+
+# resolved signatures of injected functions.  Each entry also records everything
+# the signature was resolved from (see `_sig_cache_key`), so that decorating the same
+# function again with the same settings skips type resolution entirely.
+_SIG_CACHE: weakref.WeakKeyDictionary[Callable, tuple[tuple, Signature]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _resolve_sig_cached(
+    func: Callable,
+    localns: dict,
+    on_unresolved_required_args: RaiseWarnReturnIgnore,
+    on_unannotated_required_args: RaiseWarnReturnIgnore,
+    guess_self: bool,
+) -> Signature | None:
+    """Cached version of `_resolve_sig_or_inform`.
+
+    Only signatures in which every annotation was resolved (and where no required
+    parameter is unannotated) are cached, so that the user is still informed of
+    problems every time.  Signatures that depend on the function's globals (forward
+    references, or a class guessed for `self`) are not cached either, since those
+    may be rebound.
+    """
+    key = _sig_cache_key(
+        func, on_unresolved_required_args, on_unannotated_required_args, guess_self
+    )
+    if key is not None:
+        cached = _SIG_CACHE.get(func)
+        if (
+            cached is not None
+            and len(cached[0]) == len(key)
+            and all(a is b for a, b in zip(cached[0], key))
+        ):
+            return cached[1]
+
+    sig = _resolve_sig_or_inform(
+        func,
+        localns=localns,
+        on_unresolved_required_args=on_unresolved_required_args,
+        on_unannotated_required_args=on_unannotated_required_args,
+        guess_self=guess_self,
+    )
+    if sig is not None and key is not None and _is_fully_resolved(sig):
+        # don't cache a first parameter annotated by guess_self from func's globals
+        p0 = next(iter(sig.parameters), None)
+        if not (
+            guess_self
+            and p0 is not None
+            and p0 not in func.__annotations__
+            and _guessed_self_class_name(func, p0) is not None
+        ):
+            _SIG_CACHE[func] = (key, sig)
+    return sig
+
+
+def _sig_cache_key(func: Callable, *opts: object) -> tuple | None:
+    """Return the objects that the resolved signature of `func` depends on.
+
+    These are the inject options, and `func`'s code, defaults and raw annotations,
+    to be compared by identity.  Returns `None` if the signature shouldn't be cached:
+    if `func` isn't a plain function (or wraps, or overrides the signature of,
+    another), or if any annotation is (or contains) a forward reference, which may be
+    resolved through the function's globals.  (Since only annotations without forward
+    references are cached, the local namespace needn't be part of the key.)
+    """
+    if (
+        type(func) is not types.FunctionType
+        or hasattr(func, "__wrapped__")
+        or hasattr(func, "__signature__")
+    ):
+        return None
+    annotations = func.__annotations__
+    if any(_has_forward_ref(v) for v in annotations.values()):
+        return None
+    return (
+        *opts,
+        func.__code__,
+        func.__defaults__,
+        func.__kwdefaults__,
+        *chain.from_iterable(annotations.items()),
+    )
+
+
+def _has_forward_ref(hint: object) -> bool:
+    """Return True if `hint` is, or has an argument that is, a forward reference."""
+    if isinstance(hint, (str, ForwardRef)):
+        return True
+    args = getattr(hint, "__args__", None)
+    return isinstance(args, tuple) and any(_has_forward_ref(a) for a in args)
+
+
+def _is_fully_resolved(sig: Signature) -> bool:
+    """Return True if `sig` has no unresolved or missing required annotations."""
+    for param in sig.parameters.values():
+        if isinstance(param.annotation, (str, ForwardRef)) or (
+            param.annotation is param.empty and param.default is param.empty
+        ):
+            return False
+    return not isinstance(sig.return_annotation, (str, ForwardRef))
+
+
+def _provider_type_from_hints(hints: dict[str, Any]) -> Any:
+    """Return the type a provider provides, given its resolved type hints."""
+    return hints.get("return")
+
+
+def _processor_type_from_hints(hints: dict[str, Any]) -> Any:
+    """Return the type a processor processes, given its resolved type hints."""
+    return next((v for k, v in hints.items() if k != "return"), None)
 
 
 def _validate_provider(obj: T | Callable[[], T]) -> Callable[[], T]:
@@ -1154,7 +1570,13 @@ def _validate_processor(obj: Callable[[T], Any]) -> Callable[[T], Any]:
     """
     if not callable(obj):
         raise ValueError(f"Processors must be callable. Got {obj!r}")
-    co: CodeType | None = getattr(obj, "__code__", None)
+    co: CodeType | None
+    if type(obj) is types.FunctionType:
+        co = obj.__code__
+    elif type(obj) is types.MethodType:
+        co = getattr(obj.__func__, "__code__", None)
+    else:
+        co = getattr(obj, "__code__", None)
     if not co:
         # if we don't have a code object, we can't check the number of arguments
         # TODO: see if we can do better in the future, but better to just return
@@ -25,6 +25,27 @@ def _typing_names() -> dict[str, Any]:
     return {**typing.__dict__, **types.__dict__}
 
 
+def _guessed_self_class_name(func: Callable, first_param: str) -> str | None:
+    """Return the class name `guess_self` would look up for `func`, if any.
+
+    This is the name preceding `func.__name__` in its `__qualname__`, provided that
+    the qualname looks like a (non-local) method, and that `first_param` is named
+    "self" or starts with an underscore.  (Whether the first parameter is annotated
+    is left to the caller.)  See `type_resolved_signature` for details.
+    """
+    # The best identifier i can figure for a class method is that:
+    # 1. its qualname contains a period (e.g. "MyClass.my_method"),
+    # 2. the first parameter tends to be named "self", or some private variable
+    qualname = getattr(func, "__qualname__", "")
+    if (
+        "." in qualname
+        and "<locals>" not in qualname  # don't support locally defd types
+        and (first_param == "self" or first_param.startswith("_"))
+    ):
+        return qualname.replace(func.__name__, "").rstrip(".")
+    return None
+
+
 def _unwrap_partial(func: Any) -> Any:
     while isinstance(func, PARTIAL_TYPES):
         func = func.func  # type: ignore [attr-defined]
@@ -61,9 +82,9 @@ def resolve_type_hints(
     dict[str, Any]
         mapping of object name to type hint for all annotated attributes of `obj`.
     """
-    _localns = dict(_typing_names())
-    if localns:
-        _localns.update(localns)  # explicitly provided locals take precedence
+    # explicitly provided locals take precedence. (get_type_hints doesn't mutate
+    # localns, so the shared typing namespace needn't be copied when there are none)
+    _localns = {**_typing_names(), **localns} if localns else _typing_names()
     return typing.get_type_hints(
         _unwrap_partial(obj),
         globalns=globalns,
@@ -161,19 +182,10 @@ def type_resolved_signature(
     hints = {}
     if guess_self and sig.parameters:
         p0 = next(iter(sig.parameters.values()))
-        # The best identifier i can figure for a class method is that:
-        # 1. its qualname contains a period (e.g. "MyClass.my_method"),
-        # 2. the first parameter tends to be named "self", or some private variable
-        # 3. the first parameter tends to be unannotated
-        qualname = getattr(func, "__qualname__", "")
-        if (
-            "." in qualname
-            and "<locals>" not in qualname  # don't support locally defd types
-            and (p0.name == "self" or p0.name.startswith("_"))
-            and p0.annotation is p0.empty
-        ):
+        # the first parameter of a method also tends to be unannotated
+        cls_name = _guessed_self_class_name(func, p0.name)
+        if cls_name is not None and p0.annotation is p0.empty:
             # look up the class name in the function's globals
-            cls_name = qualname.replace(func.__name__, "").rstrip(".")
             func_globals = getattr(func, "__globals__", {})
             if cls_name in func_globals:
                 # add it to the type hints
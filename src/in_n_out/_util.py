@@ -1,4 +1,5 @@
 import types
+from functools import lru_cache
 from typing import Any, Union, cast, get_origin
 
 _compiled: bool = False
@@ -20,7 +21,24 @@ def is_optional(type_: Any) -> bool:
     return _split_union(type_)[1]
 
 
-def _split_union(type_: Any) -> tuple[list[type], bool]:
+def _split_union(type_: Any) -> tuple[tuple[Any, ...], bool]:
+    """Split `type_` into its (non-None) Union members, and whether it is Optional.
+
+    Results are cached for hashable hints.
+    """
+    try:
+        # Union equality ignores member order, so key on the (ordered) args too.
+        return _split_union_cached(type_, getattr(type_, "__args__", None))
+    except TypeError:  # unhashable hint
+        return _do_split_union(type_)
+
+
+@lru_cache(maxsize=1024)
+def _split_union_cached(type_: Any, _args: Any) -> tuple[tuple[Any, ...], bool]:
+    return _do_split_union(type_)
+
+
+def _do_split_union(type_: Any) -> tuple[tuple[Any, ...], bool]:
     optional = False
     if _is_union(type_):
         types = []
@@ -29,9 +47,8 @@ def _split_union(type_: Any) -> tuple[list[type], bool]:
                 optional = True
             else:
                 types.append(arg)
-    else:
-        types = [type_]
-    return types, optional
+        return tuple(types), optional
+    return (type_,), optional
 
 
 def issubclassable(obj: Any) -> bool:
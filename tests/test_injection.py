@@ -3,7 +3,7 @@ from collections.abc import Generator, Sequence
 from contextlib import AbstractContextManager, nullcontext
 from inspect import isgeneratorfunction
 from typing import TYPE_CHECKING, Callable, Optional
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -111,6 +111,42 @@ def test_injection_without_args():
 
     assert inject(f) is f
 
+    def g(x=1, *, y=None) -> int: ...
+
+    assert inject(g) is g
+    assert inject(g, processors=True) is not g
+
+    def h(x: int) -> None: ...
+
+    assert inject_processors(h) is h
+    assert inject(h, providers=False, processors=True) is h
+
+    # the first parameter of a method may still be injected with an instance
+    thing = _Thing()
+    injected = inject(_Thing.meth)
+    assert injected is not _Thing.meth
+    with register(providers={_Thing: lambda: thing}):
+        assert injected() is thing
+
+    # annotations are read from the wrapper, not the function it wraps
+    def inner(x=None):  # type: ignore
+        return x
+
+    @functools.wraps(inner)
+    def wrapper(*args, **kwargs):  # type: ignore
+        return inner(*args, **kwargs)
+
+    wrapper.__annotations__ = {"x": int}
+    injected = inject(wrapper)
+    assert injected is not wrapper
+    with register(providers={int: lambda: 42}):
+        assert injected() == 42
+
+
+class _Thing:
+    def meth(_self=None):  # type: ignore
+        return _self
+
 
 def unannotated(x) -> int: ...  # type: ignore
 def unknown(v: "Unknown") -> int: ...  # type: ignore  #noqa
@@ -304,3 +340,137 @@ def test_inject_into_optional_with_default() -> None:
         assert inject(f)() is thing
 
     assert inject(f)() is None
+
+
+def test_resolved_signature_cache(test_store: Store) -> None:
+    from in_n_out import _store
+
+    class T: ...
+
+    def f(t: T) -> None: ...
+
+    def g(t: "Hint") -> None:  # type: ignore  # noqa: F821
+        ...
+
+    test_store.namespace = {"Hint": T}
+    with patch.object(
+        _store, "_resolve_sig_or_inform", wraps=_store._resolve_sig_or_inform
+    ) as resolve:
+        assert test_store.inject(f).__annotations__["t"] is T
+        assert test_store.inject(f).__annotations__["t"] is T
+        resolve.assert_called_once()
+
+        # string annotations are resolved every time ...
+        assert test_store.inject(g).__annotations__["t"] is T
+        assert resolve.call_count == 2
+
+        # ... so changing the namespace is picked up
+        class T2: ...
+
+        test_store.namespace = {"Hint": T2}
+        assert test_store.inject(g).__annotations__["t"] is T2
+        assert resolve.call_count == 3
+
+
+class _Rebound: ...
+
+
+def _uses_rebound(x: "_Rebound") -> None: ...
+
+
+def test_resolved_signature_cache_globals(
+    test_store: Store, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert test_store.inject(_uses_rebound).__annotations__["x"] is _Rebound
+
+    class New: ...
+
+    # rebinding the name in the function's module is picked up by a second inject
+    monkeypatch.setitem(_uses_rebound.__globals__, "_Rebound", New)
+    assert test_store.inject(_uses_rebound).__annotations__["x"] is New
+
+
+def test_resolved_signature_cache_annotations(test_store: Store) -> None:
+    class T: ...
+
+    def f(x: int) -> None: ...
+
+    assert test_store.inject(f).__annotations__["x"] is int
+    f.__annotations__["x"] = T
+    assert test_store.inject(f).__annotations__["x"] is T
+
+
+def test_resolved_signature_cache_defaults(test_store: Store) -> None:
+    from inspect import signature
+
+    def f(x: int = 1, *, y: int = 2) -> tuple:
+        return x, y
+
+    assert test_store.inject(f)() == (1, 2)
+    f.__defaults__ = (5,)
+    f.__kwdefaults__ = {"y": 6}
+    injected = test_store.inject(f)
+    assert str(signature(injected)) == "(x: int = 5, *, y: int = 6) -> tuple"
+    assert injected() == (5, 6)
+
+
+def _sig_func(a: int, b: str = "b", *, c: float = 1.0) -> None: ...
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        ((), {}),
+        ((1,), {}),
+        ((1, "x"), {}),
+        ((1,), {"c": 2.0}),
+        ((), {"b": "x", "a": 1}),
+        ((1, "x", 3), {}),  # too many positional arguments
+        ((1,), {"a": 2}),  # multiple values for 'a'
+        ((), {"d": 1}),  # unexpected keyword argument
+    ],
+)
+def test_binder_matches_bind_partial(args: tuple, kwargs: dict) -> None:
+    from inspect import signature
+
+    from in_n_out._store import _make_binder
+
+    sig = signature(_sig_func)
+    try:
+        bound = sig.bind_partial(*args, **kwargs)
+    except TypeError as e:
+        with pytest.raises(TypeError, match=str(e)):
+            _make_binder(sig)(args, kwargs)
+    else:
+        bound.apply_defaults()
+        assert _make_binder(sig)(args, kwargs) == bound.arguments
+
+
+def test_inject_all_args_given_wrapper(test_store: Store) -> None:
+    from functools import wraps
+
+    def inner(a: int, b: int) -> tuple: ...
+
+    @wraps(inner)
+    def outer(**kw: int) -> tuple:
+        return kw["a"], kw["b"]
+
+    # the signature comes from `inner`, but `outer` only accepts keywords
+    assert test_store.inject(outer)(1, 2) == (1, 2)
+
+
+def test_inject_all_args_given(test_store: Store) -> None:
+    provider = Mock(return_value=1)
+    test_store.register_provider(provider, type_hint=int)
+
+    @test_store.inject
+    def f(a: int, *, b: str = "b") -> tuple:
+        return a, b
+
+    assert f(2, b="x") == (2, "x")
+    assert f(a=2, b="x") == (2, "x")
+    provider.assert_not_called()
+
+    # a None value is still injected
+    assert f(None, b="x") == (1, "x")
+    provider.assert_called_once()
@@ -123,6 +123,25 @@ def test_unlikely_processor():
         ino.register(processors={int: 1})  # type: ignore
 
 
+def test_method_wrapping_callable_instance(test_store: ino.Store) -> None:
+    import types
+
+    mock = Mock()
+
+    class CallableInstance:
+        def __call__(self, owner: object, x: int) -> None:
+            mock(owner, x)
+
+    class Owner: ...
+
+    owner = Owner()
+    # a bound method whose __func__ has no code object is accepted as is
+    method = types.MethodType(CallableInstance(), owner)
+    test_store.register_processor(method, type_hint=int)
+    test_store.process(1)
+    mock.assert_called_once_with(owner, 1)
+
+
 def test_global_register():
     mock = Mock()
 
@@ -1,5 +1,5 @@
 from collections.abc import Sequence
-from typing import Optional
+from typing import Optional, Union
 
 import pytest
 
@@ -103,3 +103,9 @@ def test_global_register():
 
     ino.register_provider(f)
     assert ino.provide(int) == 1
+
+
+def test_union_provider_order(test_store: ino.Store) -> None:
+    test_store.register(providers=[(lambda: 1, int), (lambda: "a", str)])
+    assert test_store.provide(Union[int, str]) == 1
+    assert test_store.provide(Union[str, int]) == "a"
@@ -78,6 +78,12 @@ def test_store_namespace(test_store: Store) -> None:
 
     assert isinstance(use_t2(), T)
 
+    # locals given to inject are merged into a copy of the store namespace
+    ns = {"Hint": T}
+    test_store.namespace = ns
+    test_store.inject(use_t, localns={"Other": int})
+    assert ns == {"Hint": T}
+
 
 def test_weakrefs_to_bound_methods(test_store: Store) -> None:
     import gc
@@ -108,6 +114,10 @@ def test_weakrefs_to_bound_methods(test_store: Store) -> None:
     gc.collect()
 
     assert reft() is None
+    # dead methods are pruned as soon as their owner is collected
+    assert not test_store._providers
+    assert not test_store._processors
+
     test_store.process(1)
     mock.assert_not_called()
 
@@ -115,3 +125,82 @@ def test_weakrefs_to_bound_methods(test_store: Store) -> None:
 
     assert not test_store._providers
     assert not test_store._processors
+
+
+def test_resolved_cache_invalidation(test_store: Store) -> None:
+    class A: ...
+
+    class B(A): ...
+
+    assert test_store.provide(B) is None
+
+    with test_store.register(providers=[(lambda: 1, A)]):
+        assert test_store.provide(B) == 1
+        with test_store.register(providers=[(lambda: 2, A, 10)]):
+            assert test_store.provide(B) == 2
+        assert test_store.provide(B) == 1
+
+    assert test_store.provide(B) is None
+
+
+def test_resolved_cache_abc_registration(test_store: Store) -> None:
+    import abc
+
+    class Sz(abc.ABC): ...  # noqa: B024
+
+    class Q: ...
+
+    mock = Mock()
+    test_store.register_processor(mock, type_hint=Sz)
+    test_store.process(Q())
+    mock.assert_not_called()
+
+    # registering a virtual subclass is picked up by the next lookup
+    Sz.register(Q)
+    test_store.process(Q())
+    mock.assert_called_once()
+
+
+def test_resolved_cache_doesnt_keep_classes_alive(test_store: Store) -> None:
+    import gc
+    import weakref
+
+    class A: ...
+
+    test_store.register_processor(lambda x: None, type_hint=A)
+
+    C = type("C", (), {})
+    test_store.process(C())
+    ref = weakref.ref(C)
+    del C
+    gc.collect()
+    assert ref() is None
+
+
+def test_cache_updates_match_rebuild(test_store: Store) -> None:
+    class A: ...
+
+    class B: ...
+
+    class C(A, B): ...
+
+    def provided_by(store: Store) -> list:
+        return [p() for p in store.iter_providers(C)]
+
+    ctx1 = test_store.register_provider(lambda: "a1", A)
+    test_store.register_provider(lambda: "b1", B)
+    ctx2 = test_store.register_provider(lambda: "a2", A, weight=1)
+    test_store.register_provider(lambda: "a3", A, weight=1)
+    assert provided_by(test_store) == ["a2", "a3", "a1"]
+
+    ctx2.cleanup()
+    assert provided_by(test_store) == ["a3", "a1"]
+
+    # A was registered before B, so it takes precedence for subclasses of both,
+    # until its earliest registration is removed.
+    ctx1.cleanup()
+    assert provided_by(test_store) == ["b1"]
+
+    # compare against a map freshly built from the registry
+    test_store._invalidate_cache(True)
+    assert provided_by(test_store) == ["b1"]